@@ -1,13 +1,28 @@
-from contextlib import asynccontextmanager, contextmanager
-from dataclasses import InitVar, dataclass
-from types import SimpleNamespace
-from typing import Optional, AsyncIterator
-
+import asyncio
+import hashlib
+import keyword
+import os
+import pickle
+import tempfile
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AsyncExitStack, asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import AsyncIterator, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import sqlalchemy
 from pydantic import BaseModel, FilePath
-from sqlalchemy import MetaData, Table, create_engine
+from sqlalchemy import MetaData, Table, create_engine, text
 from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.engine.url import URL
+from sqlalchemy.exc import InvalidRequestError
 from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.sql.base import SchemaEventTarget
+from sqlalchemy.types import TypeEngine
 
 
 class SqlTlsConfig(BaseModel):
@@ -19,14 +34,25 @@ class SqlTlsConfig(BaseModel):
     def to_connect_args(self):
         connect_params = {"sslmode": self.sslmode}
         if self.clientCert is not None:
-            connect_params["sslcert"] = self.clientCert
+            connect_params["sslcert"] = str(self.clientCert)
         if self.clientKey is not None:
-            connect_params["sslkey"] = self.clientKey
+            connect_params["sslkey"] = str(self.clientKey)
         if self.serverCa is not None:
-            connect_params["sslrootcert"] = self.serverCa
+            connect_params["sslrootcert"] = str(self.serverCa)
         return connect_params
 
 
+_NON_URL_FIELDS = {
+    "tls",
+    "engine_args",
+    "async_engine_args",
+    "metadata_cache_path",
+    "statement_cache_size",
+    "lazy_reflection",
+    "execution_options",
+}
+
+
 class SqlConfig(BaseModel):
     host: str
     port: int
@@ -36,68 +62,637 @@ class SqlConfig(BaseModel):
     engine_args: dict = {}
     async_engine_args: dict = {}
     tls: Optional[SqlTlsConfig]
+    metadata_cache_path: Optional[Path] = None
+    # asyncpg statement cache size, set to 0 behind pgbouncer in transaction mode
+    statement_cache_size: Optional[int] = None
+    # reflect each schema on first access instead of when creating the state
+    lazy_reflection: bool = False
+    # applied to every connection, eg. {"stream_results": True, "max_row_buffer": 1000}
+    execution_options: dict = {}
+
+    def _url(self, drivername: str = "postgresql") -> URL:
+        return URL.create(drivername, **self.model_dump(exclude=_NON_URL_FIELDS))
 
 
 @dataclass(frozen=True)
+class SchemaSpec:
+    """
+    A schema to reflect, restricted to the tables and views in `only`.
+    Pass it instead of the schema name, eg. `my_schema=SchemaSpec("data", ["users"])`.
+    Other tables of the schema are reflected individually on first access.
+    """
+
+    name: str
+    only: Optional[Iterable[str]] = None
+
+    def __post_init__(self):
+        if isinstance(self.only, str):
+            raise TypeError(
+                f"SchemaSpec.only must be a collection of table names, "
+                f"not the string {self.only!r}"
+            )
+
+
+def _schema_specs(schemas) -> Dict[str, Optional[FrozenSet[str]]]:
+    """
+    Map each schema name to the tables to reflect, None for all of them.
+    A schema given several times gets the union of the tables.
+    """
+    specs = {}
+    for schema in schemas:
+        if not isinstance(schema, SchemaSpec):
+            schema = SchemaSpec(schema)
+        only = None if schema.only is None else frozenset(schema.only)
+        if schema.name not in specs:
+            specs[schema.name] = only
+        elif specs[schema.name] is None or only is None:
+            specs[schema.name] = None
+        else:
+            specs[schema.name] = specs[schema.name] | only
+    return specs
+
+
+def _reflect_schema(engine, schema, only=None, metadata=None):
+    if metadata is None:
+        metadata = MetaData()
+    metadata.reflect(
+        bind=engine,
+        schema=schema,
+        views=True,
+        only=None if only is None else sorted(only),
+        resolve_fks=False,
+    )
+    _reflect_referred_tables(engine, metadata)
+    return metadata
+
+
+def _table_key(schema: Optional[str], name: str) -> str:
+    return name if schema is None else f"{schema}.{name}"
+
+
+def _reflect_referred_tables(
+    engine, metadata: MetaData, tables: Optional[Iterable[Table]] = None
+) -> List[Table]:
+    """
+    Reflect the tables referred to by foreign keys of `tables` (all tables
+    of `metadata` by default) which are missing in `metadata`, transitively,
+    one `reflect` per schema rather than table by table as `resolve_fks` would.
+    Returns the tables reflected this way.
+    """
+    pending = list(metadata.tables.values() if tables is None else tables)
+    reflected = []
+    while pending:
+        missing = {}
+        for table in pending:
+            for fk in table.foreign_keys:
+                schema, name, _ = fk._column_tokens
+                if _table_key(schema, name) not in metadata.tables:
+                    missing.setdefault(schema, set()).add(name)
+        pending = []
+        for schema, names in missing.items():
+            metadata.reflect(
+                bind=engine, schema=schema, only=sorted(names), resolve_fks=False
+            )
+            pending += [metadata.tables[_table_key(schema, name)] for name in names]
+        reflected += pending
+    return reflected
+
+
+def _reflection_workers(engine, n: int) -> int:
+    """How many of `n` schemas can be reflected at once on the engine's pool"""
+    if isinstance(engine, Connection) or not isinstance(engine.pool, QueuePool):
+        return 1
+    pool = engine.pool
+    if pool._max_overflow < 0:
+        # unlimited overflow
+        return n
+    return max(min(n, pool.size() + pool._max_overflow), 1)
+
+
+def _reflect_schemas(engine, schemas: Dict[str, Optional[FrozenSet[str]]]):
+    """
+    Reflect the given schemas into one MetaData.
+    Several schemas are reflected concurrently, each on its own pooled
+    connection, and merged afterwards, as MetaData is not thread-safe.
+    At most as many schemas as the engine's pool can hand out connections
+    are reflected at once, the others wait for a free worker.
+    A single connection given instead of an engine reflects them one by one.
+    """
+    workers = _reflection_workers(engine, len(schemas))
+    if workers <= 1:
+        metadata = MetaData()
+        for schema, only in sorted(schemas.items()):
+            _reflect_schema(engine, schema, only, metadata)
+        return metadata
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        reflected = list(
+            executor.map(
+                lambda item: _reflect_schema(engine, *item), sorted(schemas.items())
+            )
+        )
+    metadata = MetaData()
+    for partial in reflected:
+        _merge_metadata(metadata, partial)
+    return metadata
+
+
+def _merge_metadata(metadata: MetaData, source: MetaData):
+    # foreign keys are copied by their string targets, so the order doesn't
+    # matter, and sorted_tables would warn about foreign key cycles
+    for table in list(source.tables.values()):
+        # tables already merged (eg. as foreign key targets) are kept
+        if table.key not in metadata.tables:
+            table.to_metadata(metadata)
+
+
+# covers the given schemas and, transitively, those their foreign keys refer to;
+# needs PostgreSQL 12 or later for `attgenerated`
+_CATALOG_FINGERPRINT = text(
+    """
+    WITH RECURSIVE referred(nspname) AS (
+        SELECT unnest(CAST(:schemas AS text[]))
+        UNION
+        SELECT rn.nspname::text
+        FROM referred r
+        JOIN pg_namespace n ON n.nspname = r.nspname
+        JOIN pg_class c ON c.relnamespace = n.oid
+        JOIN pg_constraint con ON con.conrelid = c.oid AND con.contype = 'f'
+        JOIN pg_class rc ON rc.oid = con.confrelid
+        JOIN pg_namespace rn ON rn.oid = rc.relnamespace
+    ),
+    cols AS (
+        SELECT n.nspname, c.oid AS relid, c.relname, c.relkind, a.attname, a.attnum,
+            a.atttypid, a.atttypmod, a.attnotnull, a.attidentity, a.attgenerated
+        FROM pg_attribute a
+        JOIN pg_class c ON c.oid = a.attrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname IN (SELECT nspname FROM referred)
+            AND a.attnum > 0 AND NOT a.attisdropped
+    )
+    SELECT md5(coalesce(string_agg(entry, ',' ORDER BY entry), ''))
+    FROM (
+        SELECT col.nspname || '.' || col.relname || ':' || col.relkind || ':'
+            || col.attname || ':' || format_type(col.atttypid, col.atttypmod) || ':'
+            || col.attnotnull || ':' || coalesce(pg_get_expr(d.adbin, d.adrelid), '')
+            || ':' || col.attidentity || ':' || col.attgenerated
+            || ':' || coalesce(col_description(col.relid, col.attnum), '')
+            || ':' || coalesce(obj_description(col.relid, 'pg_class'), '')
+        FROM cols col
+        LEFT JOIN pg_attrdef d ON d.adrelid = col.relid AND d.adnum = col.attnum
+        UNION ALL
+        SELECT n.nspname || '.' || c.relname || ':' || con.conname || ':'
+            || pg_get_constraintdef(con.oid)
+        FROM pg_constraint con
+        JOIN pg_class c ON c.oid = con.conrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname IN (SELECT nspname FROM referred)
+        UNION ALL
+        SELECT schemaname || '.' || indexname || ':' || indexdef
+        FROM pg_indexes
+        WHERE schemaname IN (SELECT nspname FROM referred)
+        UNION ALL
+        -- labels of the enums used by the columns, directly or as array elements
+        SELECT 'enum:' || format_type(e.enumtypid, NULL) || ':'
+            || string_agg(e.enumlabel, ',' ORDER BY e.enumsortorder)
+        FROM pg_enum e
+        WHERE e.enumtypid IN (
+            SELECT col.atttypid FROM cols col
+            UNION
+            SELECT t.typelem FROM cols col JOIN pg_type t ON t.oid = col.atttypid
+        )
+        GROUP BY e.enumtypid
+    ) AS catalog(entry)
+    """
+)
+
+
+@contextmanager
+def _connect(bind):
+    if isinstance(bind, Connection):
+        yield bind
+    else:
+        with bind.connect() as c:
+            yield c
+
+
+def _metadata_cache_file(engine, schemas, cache_dir: Path) -> Path:
+    """
+    Name the cache file after the database, the schemas and their tables,
+    the server and sqlalchemy versions and a fingerprint of the columns
+    (with defaults, identity, generation and comments), constraints, indexes
+    and used enum labels of the schemas and of the schemas their foreign keys
+    refer to, so changing any of them invalidates the cache.
+    """
+    names = sorted(schemas)
+    with _connect(engine) as c:
+        fingerprint = c.execute(_CATALOG_FINGERPRINT, {"schemas": names}).scalar()
+    url = engine.engine.url
+    key = repr(
+        (
+            url.host,
+            url.port,
+            url.database,
+            [(name, schemas[name] and sorted(schemas[name])) for name in names],
+            engine.dialect.server_version_info,
+            sqlalchemy.__version__,
+            fingerprint,
+        )
+    )
+    return cache_dir / f"metadata-{hashlib.sha256(key.encode()).hexdigest()}.pickle"
+
+
+def _load_metadata(engine, schemas, cache_dir: Optional[Path]) -> MetaData:
+    """
+    Reflect the schemas, or load them from `cache_dir` if it is given
+    and holds a pickle for the current state of the schemas.
+    """
+    if cache_dir is None:
+        return _reflect_schemas(engine, schemas)
+    cache_file = _metadata_cache_file(engine, schemas, Path(cache_dir))
+    try:
+        with cache_file.open("rb") as f:
+            return pickle.load(f)
+    except Exception:
+        # missing, truncated or written by an incompatible version
+        pass
+    metadata = _reflect_schemas(engine, schemas)
+    _write_cache(cache_file, metadata)
+    return metadata
+
+
+def _write_cache(cache_file: Path, metadata: MetaData):
+    """Pickle `metadata` to `cache_file`, only warning if that's not possible"""
+    tmp_file = None
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_file = tempfile.mkstemp(dir=cache_file.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(metadata, f)
+        os.replace(tmp_file, cache_file)
+        tmp_file = None
+    except Exception as e:
+        warnings.warn(f"Could not write metadata cache {cache_file}: {e}")
+    finally:
+        if tmp_file is not None:
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+
+
+# reflected column types by class and attributes, shared between all states
+_interned_types: Dict[tuple, TypeEngine] = {}
+
+
+def _intern_types(tables: Iterable[Table]):
+    """
+    Let all columns with equal types share one type instance.
+    Types attached to their table or column (eg. `Enum`) keep their own instance.
+    """
+    for table in tables:
+        for column in table.columns:
+            type_ = column.type
+            if isinstance(type_, SchemaEventTarget):
+                continue
+            key = (type(type_), tuple(sorted(vars(type_).items())))
+            try:
+                column.type = _interned_types.setdefault(key, type_)
+            except TypeError:
+                # attributes like lists can't be hashed, keep the type as it is
+                pass
+
+
+class _Reflection:
+    """
+    The metadata shared by the `SchemaContainer`s of one state.
+    Schemas are reflected (or loaded from the cache) on demand,
+    each one at most once.
+    """
+
+    def __init__(
+        self,
+        engine,
+        schemas: Dict[str, Optional[FrozenSet[str]]],
+        metadata_cache_path: Optional[Path] = None,
+    ):
+        self.engine = engine
+        self.schemas = schemas
+        self.metadata_cache_path = metadata_cache_path
+        self.metadata = MetaData()
+        self._reflected = frozenset()
+        self._lock = threading.Lock()
+
+    def reflect(self, schemas):
+        if self.engine is None:
+            raise RuntimeError(
+                f"Schemas {sorted(schemas)} were not reflected upfront "
+                "and can't be reflected later on"
+            )
+        with self._lock:
+            missing = set(schemas) - self._reflected
+            if not missing:
+                return
+            loaded = _load_metadata(
+                self.engine,
+                {schema: self.schemas[schema] for schema in missing},
+                self.metadata_cache_path,
+            )
+            _intern_types(loaded.tables.values())
+            if self._reflected:
+                _merge_metadata(self.metadata, loaded)
+            else:
+                self.metadata = loaded
+            self._reflected |= missing
+
+    def tables(self, schema: str) -> Dict[str, Table]:
+        if schema not in self._reflected:
+            self.reflect([schema])
+        return {
+            table.name: table
+            for table in list(self.metadata.tables.values())
+            if table.schema == schema
+        }
+
+    def table(self, schema: str, name: str) -> Table:
+        if schema not in self._reflected:
+            self.reflect([schema])
+        try:
+            return self.metadata.tables[f"{schema}.{name}"]
+        except KeyError:
+            pass
+        if self.schemas[schema] is None:
+            # let sqlalchemy raise its usual error for unknown tables
+            return Table(name, self.metadata, schema=schema, mustexist=True)
+        if self.engine is None:
+            raise InvalidRequestError(
+                f"Table '{schema}.{name}' is not in the SchemaSpec's `only` list, "
+                "and it can't be reflected later on for async states"
+            )
+        with self._lock:
+            table = Table(
+                name,
+                self.metadata,
+                schema=schema,
+                autoload_with=self.engine,
+                resolve_fks=False,
+            )
+            referred = _reflect_referred_tables(self.engine, self.metadata, [table])
+            _intern_types([table, *referred])
+            return table
+
+
 class SchemaContainer:
     """
     Convenient wrapper for `tables` and/or `sql.Table`,
     guaranteeing that we've reflected the database and all tables are available.
     Also reflects views.
+    The schema is reflected on first access unless that already happened
+    upfront, and its metadata is shared with the other schemas of the state.
     """
 
-    engine: InitVar[Engine]
+    # reflected tables are stored in `__dict__`, so accessing them
+    # is a plain attribute lookup which does not reach `__getattr__`
+    __slots__ = ("_reflection", "name", "__dict__")
+
+    _reflection: _Reflection
     name: str
 
-    def __post_init__(self, engine):
-        metadata = MetaData(schema=self.name)
-        metadata.reflect(bind=engine, views=True)
-        object.__setattr__(self, "_metadata", metadata)
+    def __init__(self, reflection: _Reflection, name: str):
+        self._reflection = reflection
+        self.name = name
+
+    def __repr__(self):
+        return f"{type(self).__name__}(name={self.name!r})"
 
     def __getattr__(self, name):
-        return Table(name, self._metadata, schema=self.name, mustexist=True)
+        if name.startswith("__"):
+            # protocol lookups (eg. `__deepcopy__`) are not table names
+            raise AttributeError(name)
+        table = self._reflection.table(self.name, name)
+        self.__dict__[name] = table
+        return table
+
+
+def _promote_tables(container: SchemaContainer):
+    # tables named like an attribute of the container (eg. `name`) are
+    # shadowed by it and stay accessible via the metadata only
+    vars(container).update(
+        (name, table)
+        for name, table in container._reflection.tables(container.name).items()
+        if not hasattr(SchemaContainer, name)
+    )
+
+
+class _SchemaNamespace:
+    """
+    Base of the namespaces holding the `SchemaContainer`s of a state.
+    Subclasses with one slot per schema are generated by `_make_namespace`.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, **schemas):
+        for name, schema in schemas.items():
+            setattr(self, name, schema)
+
+    def __repr__(self):
+        items = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({items})"
 
+    def _asdict(self) -> Dict[str, "SchemaContainer"]:
+        """The schemas by name, as `vars` can't be used on slotted instances"""
+        return {name: getattr(self, name) for name in self.__slots__}
 
-def _make_schema_namespace(engine, **schemas):
-    return SimpleNamespace(
-        **{name: SchemaContainer(engine, schema) for name, schema in schemas.items()}
+
+@lru_cache(maxsize=None)
+def _namespace_class(names: Tuple[str, ...]):
+    return type("Schemas", (_SchemaNamespace,), {"__slots__": names})
+
+
+def _make_namespace(**schemas) -> _SchemaNamespace:
+    return _namespace_class(tuple(schemas))(**schemas)
+
+
+def _make_schema_namespace(
+    engine, metadata_cache_path=None, lazy_reflection=False, **schemas
+):
+    """
+    Each keyword maps an attribute name to a schema name or a `SchemaSpec`.
+    `engine` may also be a connection, which is only used while reflecting
+    all schemas upfront, so `lazy_reflection` does not apply to it.
+    """
+    reflection = _Reflection(
+        engine, _schema_specs(schemas.values()), metadata_cache_path
     )
+    if not lazy_reflection or isinstance(engine, Connection):
+        reflection.reflect(reflection.schemas)
+    if isinstance(engine, Connection):
+        reflection.engine = None
+    containers = {
+        name: SchemaContainer(reflection, getattr(schema, "name", schema))
+        for name, schema in schemas.items()
+    }
+    if not lazy_reflection or isinstance(engine, Connection):
+        for container in containers.values():
+            _promote_tables(container)
+    return _make_namespace(**containers)
+
+
+def _stub_class_names(schema_names: Iterable[str]) -> Dict[str, str]:
+    """Unique class names for the schemas, eg. `my_schema` -> `MySchemaSchema`"""
+    class_names = {}
+    for schema_name in schema_names:
+        base = "".join(part.capitalize() for part in schema_name.split("_")) + "Schema"
+        class_name, i = base, 1
+        while class_name in class_names.values():
+            i += 1
+            class_name = f"{base}{i}"
+        class_names[schema_name] = class_name
+    return class_names
+
+
+def schema_stub(s: _SchemaNamespace) -> str:
+    """
+    Create the source of a stub declaring the schemas in `s` (eg. `sql_state.s`)
+    with their reflected tables, so IDEs and type checkers know about them.
+    Schemas that are reflected lazily are reflected now.
+    The stub's `Schemas` class can be used to annotate `sql_state.s`.
+    """
+    class_names = _stub_class_names(s.__slots__)
+    lines = ["from sqlalchemy import Table", "", "from sqlstate import SchemaContainer"]
+    for schema_name in s.__slots__:
+        container = getattr(s, schema_name)
+        _promote_tables(container)
+        tables = sorted(
+            name
+            for name in vars(container)
+            if name.isidentifier()
+            and not keyword.iskeyword(name)
+            and not hasattr(SchemaContainer, name)
+        )
+        lines += ["", "", f"class {class_names[schema_name]}(SchemaContainer):"]
+        lines += [f"    {name}: Table" for name in tables] or ["    pass"]
+    lines += ["", "", "class Schemas:"]
+    lines += [
+        f"    {schema_name}: {class_names[schema_name]}"
+        for schema_name in s.__slots__
+    ] or ["    pass"]
+    return "\n".join(lines) + "\n"
+
+
+def _delegate(name):
+    def method(self, *args, **kwargs):
+        return getattr(self.connection, name)(*args, **kwargs)
+
+    method.__name__ = name
+    return method
 
 
-@dataclass(frozen=True)
 class SqlConnection:
     """Wrap a sqlalchemy Connection with access to the metadata"""
 
+    __slots__ = ("connection", "s")
+
     connection: Connection
-    s: SimpleNamespace
+    s: _SchemaNamespace
 
     def __init__(self, connection: Connection, **schemas):
-        object.__setattr__(self, "connection", connection)
-        object.__setattr__(self, "s", SimpleNamespace(**schemas))
+        self.connection = connection
+        self.s = _make_namespace(**schemas)
+
+    @classmethod
+    def from_namespace(cls, connection: Connection, s: _SchemaNamespace):
+        """Wrap `connection`, sharing the schema namespace `s` as it is"""
+        self = object.__new__(cls)
+        self.connection = connection
+        self.s = s
+        return self
+
+    def __repr__(self):
+        return f"{type(self).__name__}(connection={self.connection!r}, s={self.s!r})"
 
     def __getattr__(self, name):
         return getattr(self.connection, name)
 
 
-@dataclass(frozen=True)
+# the frequently used Connection API is delegated explicitly,
+# so calling it skips the failed lookup before `__getattr__`
+for _name in (
+    "execute",
+    "scalar",
+    "scalars",
+    "execution_options",
+    "begin",
+    "begin_nested",
+    "commit",
+    "rollback",
+    "close",
+):
+    setattr(SqlConnection, _name, _delegate(_name))
+del _name
+
+
 class AsyncSqlConnection:
     """Wrap an async sqlalchemy AsyncConnection with access to the metadata"""
 
+    __slots__ = ("connection", "s")
+
     connection: AsyncConnection
-    s: SimpleNamespace
+    s: _SchemaNamespace
 
     def __init__(self, connection: AsyncConnection, **schemas):
-        object.__setattr__(self, "connection", connection)
-        object.__setattr__(self, "s", SimpleNamespace(**schemas))
+        self.connection = connection
+        self.s = _make_namespace(**schemas)
+
+    @classmethod
+    def from_namespace(cls, connection: AsyncConnection, s: _SchemaNamespace):
+        """Wrap `connection`, sharing the schema namespace `s` as it is"""
+        self = object.__new__(cls)
+        self.connection = connection
+        self.s = s
+        return self
+
+    def __repr__(self):
+        return f"{type(self).__name__}(connection={self.connection!r}, s={self.s!r})"
 
     def __getattr__(self, name):
         return getattr(self.connection, name)
 
 
+for _name in (
+    "execute",
+    "scalar",
+    "scalars",
+    "stream",
+    "stream_scalars",
+    "execution_options",
+    "begin",
+    "begin_nested",
+    "commit",
+    "rollback",
+    "close",
+):
+    setattr(AsyncSqlConnection, _name, _delegate(_name))
+del _name
+
+
 class SqlState:
-    def __init__(self, engine: Engine, **schemas):
+    def __init__(
+        self,
+        engine: Engine,
+        metadata_cache_path: Optional[Path] = None,
+        lazy_reflection: bool = False,
+        execution_options: Optional[dict] = None,
+        **schemas,
+    ):
         self.engine = engine
-        self.s = _make_schema_namespace(engine, **schemas)
+        self.execution_options = execution_options or {}
+        self.s = _make_schema_namespace(
+            engine,
+            metadata_cache_path=metadata_cache_path,
+            lazy_reflection=lazy_reflection,
+            **schemas,
+        )
 
     def __enter__(self):
         return self
@@ -108,13 +703,49 @@ class SqlState:
     @contextmanager
     def connect(self):
         with self.engine.connect() as c:
-            yield SqlConnection(c, **vars(self.s))
+            if self.execution_options:
+                c.execution_options(**self.execution_options)
+            yield SqlConnection.from_namespace(c, self.s)
+
+
+async def _make_async_schema_namespace(
+    engine: AsyncEngine, metadata_cache_path=None, **schemas
+):
+    """
+    Reflect the schemas upfront on a single connection of the async engine.
+    As the connection is released afterwards, schemas are reflected one after
+    the other, never lazily, and tables outside a `SchemaSpec`'s `only` list
+    can't be reflected on access.
+    """
+    async with engine.connect() as c:
+        return await c.run_sync(
+            lambda connection: _make_schema_namespace(
+                connection, metadata_cache_path=metadata_cache_path, **schemas
+            )
+        )
+
+
+def _check_async_execution_options(execution_options: Optional[dict]):
+    # AsyncConnection.execute() refuses results streamed from a server side
+    # cursor, so applying this option to every connection breaks them all
+    if execution_options and execution_options.get("stream_results"):
+        raise ValueError(
+            "stream_results can't be set for all connections of an async "
+            "sqlstate, stream single queries with `await conn.stream(query)`"
+        )
 
 
 class AsyncSqlState:
-    def __init__(self, engine: AsyncEngine, schemas_namespace):
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        schemas_namespace,
+        execution_options: Optional[dict] = None,
+    ):
+        _check_async_execution_options(execution_options)
         self.engine = engine
         self.s = schemas_namespace
+        self.execution_options = execution_options or {}
 
     async def __aenter__(self):
         return self
@@ -125,7 +756,57 @@ class AsyncSqlState:
     @asynccontextmanager
     async def acquire(self):
         async with self.engine.connect() as c:
-            yield AsyncSqlConnection(c, **vars(self.s))
+            if self.execution_options:
+                await c.execution_options(**self.execution_options)
+            yield AsyncSqlConnection.from_namespace(c, self.s)
+
+    @asynccontextmanager
+    async def acquire_many(self, n: int) -> AsyncIterator[List[AsyncSqlConnection]]:
+        """
+        Acquire `n` connections concurrently, eg. to fan out queries.
+        `n` must not exceed what the engine's pool can hand out at once.
+        """
+        async with AsyncExitStack() as stack:
+            connections = await asyncio.gather(
+                *(stack.enter_async_context(self.engine.connect()) for _ in range(n)),
+                return_exceptions=True,
+            )
+            # only fail once all attempts are done, so the stack closes every connection
+            for c in connections:
+                if isinstance(c, BaseException):
+                    raise c
+            if self.execution_options:
+                await asyncio.gather(
+                    *(c.execution_options(**self.execution_options) for c in connections)
+                )
+            yield [AsyncSqlConnection.from_namespace(c, self.s) for c in connections]
+
+
+# pool tuning applied by the `*_from_config` functions below
+# unless overridden or a custom `poolclass` is given
+DEFAULT_POOL_ARGS = {
+    "pool_size": 10,
+    "max_overflow": 10,
+    "pool_pre_ping": True,
+    "pool_recycle": 1800,
+    "pool_timeout": 30,
+}
+# keep the most recently used connections busy, their caches are warm
+DEFAULT_ASYNC_POOL_ARGS = {**DEFAULT_POOL_ARGS, "pool_use_lifo": True}
+
+
+# asyncpg connect args applied by `asql_from_config` unless overridden
+DEFAULT_ASYNC_CONNECT_ARGS = {
+    "statement_cache_size": 1024,
+    "prepared_statement_cache_size": 100,
+    "server_settings": {"application_name": "sqlstate"},
+}
+
+def _with_pool_defaults(defaults: dict, *engine_args: dict) -> dict:
+    merged = {k: v for args in engine_args for k, v in args.items()}
+    if "poolclass" in merged:
+        return merged
+    return {**defaults, **merged}
 
 
 def sql_from_config(
@@ -137,13 +818,20 @@ def sql_from_config(
     Use the SqlConfig object to create an `SqlState`
     """
     engine_args = engine_args or {}
-    url_params = config.dict(exclude={"tls", "engine_args", "async_engine_args"})
-    url = URL.create("postgresql", **url_params)
+    url = config._url()
     connect_args = config.tls.to_connect_args() if config.tls else {}
     engine = create_engine(
-        url, **{**config.engine_args, **engine_args}, connect_args=connect_args
+        url,
+        **_with_pool_defaults(DEFAULT_POOL_ARGS, config.engine_args, engine_args),
+        connect_args=connect_args,
+    )
+    return SqlState(
+        engine,
+        metadata_cache_path=config.metadata_cache_path,
+        lazy_reflection=config.lazy_reflection,
+        execution_options=config.execution_options,
+        **schemas,
     )
-    return SqlState(engine, **schemas)
 
 
 @asynccontextmanager
@@ -153,15 +841,39 @@ async def asql_from_config(
     connect_args: Optional[dict] = None,
     **schemas,
 ) -> AsyncIterator[AsyncSqlState]:
+    _check_async_execution_options(config.execution_options)
     engine_args = engine_args or {}
-    url_params = config.dict(exclude={"tls", "engine_args", "async_engine_args"})
-    url = URL.create("postgresql+asyncpg", **url_params)
-    _connect_args = {**(connect_args or {}), **(config.tls.to_connect_args() if config.tls else {})}
+    url = config._url("postgresql+asyncpg")
+    statement_cache_args = (
+        {
+            "statement_cache_size": config.statement_cache_size,
+            "prepared_statement_cache_size": config.statement_cache_size,
+        }
+        if config.statement_cache_size is not None
+        else {}
+    )
+    _connect_args = {
+        **DEFAULT_ASYNC_CONNECT_ARGS,
+        **statement_cache_args,
+        **(connect_args or {}),
+        **(config.tls.to_connect_args() if config.tls else {}),
+    }
     engine = create_async_engine(
-        url, **{**config.async_engine_args, **engine_args}, connect_args=_connect_args
+        url,
+        **_with_pool_defaults(
+            DEFAULT_ASYNC_POOL_ARGS, config.async_engine_args, engine_args
+        ),
+        connect_args=_connect_args,
+    )
+    if config.lazy_reflection:
+        warnings.warn(
+            "lazy_reflection is not supported by asql_from_config, "
+            "all schemas are reflected upfront"
+        )
+    schemas_namespace = await _make_async_schema_namespace(
+        engine, metadata_cache_path=config.metadata_cache_path, **schemas
     )
-    sql_state = sql_from_config(config, **schemas)
-    yield AsyncSqlState(engine, sql_state.s)
+    yield AsyncSqlState(engine, schemas_namespace, config.execution_options)
 
 
 @asynccontextmanager
@@ -172,7 +884,7 @@ async def asql_from_engine(
 ) -> AsyncIterator[AsyncSqlState]:
     engine_args = engine_args or {}
     aengine = create_async_engine(
-        engine.url,
+        engine.url.set(drivername="postgresql+asyncpg"),
         **engine_args,
     )
     sql_state = SqlState(engine, **schemas)